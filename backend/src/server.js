@@ -16,6 +16,7 @@ import config from './config/index.js';
 
 // Import services
 import { initializeNodemailer } from './utils/nodemailerHelper.js';
+import { loadBiLSTMModel } from './text-service/bilstmInference.js';
 
 // Import middleware
 import { errorHandler } from './middleware/errorHandler.js';
@@ -152,6 +153,13 @@ const startServer = async () => {
 
     app.use(errorHandler);
 
+    try {
+      console.log('🧠 Loading BiLSTM model...');
+      await loadBiLSTMModel();
+    } catch (err) {
+      console.warn('⚠️ BiLSTM model failed to load:', err.message);
+    }
+
     try {
       console.log('🚀 Journal Service starting...');
       await journalService.initialize();
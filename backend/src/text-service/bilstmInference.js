@@ -97,11 +97,22 @@ const tokenize = (text) => {
 // Global session variable
 let session = null;
 
-const loadModel = async () => {
+// Called once at server start so the session creation and warm-up run
+// happen before the first request rather than inside it
+export const loadBiLSTMModel = async () => {
     if (!session) {
         try {
             session = await onnx.InferenceSession.create(MODEL_PATH);
             console.log('✅ BiLSTM ONNX model loaded successfully');
+
+            // Warm-up run on an all-<PAD> sequence so the first real request
+            // doesn't pay ONNX Runtime's one-time allocation cost
+            try {
+                const warmupTensor = new onnx.Tensor('int32', new Int32Array(MAX_LENGTH), [1, MAX_LENGTH]);
+                await session.run({ [session.inputNames[0]]: warmupTensor });
+            } catch (warmupError) {
+                console.warn('⚠️ BiLSTM warm-up run failed:', warmupError.message);
+            }
         } catch (error) {
             console.error('❌ Failed to load BiLSTM ONNX model:', error);
             throw error;
@@ -116,7 +127,7 @@ export const runBiLSTMInference = async (text) => {
             throw new Error('Empty text provided');
         }
 
-        const sess = await loadModel();
+        const sess = await loadBiLSTMModel();
         
         // Tokenize
         const inputSequence = tokenize(text);
@@ -11,142 +11,675 @@ NOTE: This script ONLY works with Wav2Vec2 audio models.
 
 import sys
 import json
+import time
+import queue
+import platform
+import threading
 import warnings
+from types import SimpleNamespace
 warnings.filterwarnings('ignore')
 
 # Disable TensorFlow warnings
 import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
 
+def get_int_env(name, default, minimum=1):
+    """
+    Read an integer setting, falling back to the default on a missing or bad
+    value instead of failing before any JSON reaches the Node side
+    """
+    value = os.environ.get(name)
+    if not value:
+        return default
+    
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        print(f"Invalid {name}={value!r}, using {default}", file=sys.stderr)
+        return default
+
+def get_num_threads():
+    """
+    Threads for intra-op (GEMM) work: VOICE_EMOTION_THREADS if set, otherwise
+    the physical cores this process may run on (respects taskset/cgroups)
+    """
+    # 0 (or unset) means auto-detect
+    configured = get_int_env('VOICE_EMOTION_THREADS', 0, minimum=0)
+    if configured:
+        return configured
+    
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        available = os.cpu_count() or 1
+    
+    # SMT siblings add little to compute-bound GEMM, so prefer physical cores
+    try:
+        import psutil
+        physical = psutil.cpu_count(logical=False)
+    except ImportError:
+        physical = None
+    
+    return max(1, min(available, physical) if physical else available)
+
+# OpenMP/MKL read these when torch loads, so they must be set before the import
+NUM_THREADS = get_num_threads()
+os.environ.setdefault('OMP_NUM_THREADS', str(NUM_THREADS))
+os.environ.setdefault('MKL_NUM_THREADS', str(NUM_THREADS))
+os.environ.setdefault('KMP_AFFINITY', 'granularity=fine,compact,1,0')
+
 try:
     from transformers import Wav2Vec2ForSequenceClassification, Wav2Vec2FeatureExtractor, AutoConfig
+    from transformers import __version__ as transformers_version
+    from transformers.modeling_utils import no_init_weights
     import torch
+    import numpy as np
     import librosa
+    import soundfile as sf
+    import soxr
 except ImportError as e:
     error_result = {
         "success": False,
-        "error": f"Missing dependencies: {str(e)}. Install with: pip install transformers torch librosa soundfile"
+        "error": f"Missing dependencies: {str(e)}. Install with: pip install transformers torch librosa soundfile soxr"
     }
     print(json.dumps(error_result))
     sys.exit(1)
 
-# Default label mapping (works for most emotion models)
-DEFAULT_LABELS = {
-    "0": "angry",
-    "1": "calm",
-    "2": "disgust",
-    "3": "fear",
-    "4": "happy",
-    "5": "neutral",
-    "6": "sad",
-    "7": "surprise"
-}
+# Resampler for non-16kHz audio: 'soxr' (default, high-quality filter) or
+# 'torchaudio' (kernel built once per source rate, Kaiser-windowed sinc tuned
+# to match librosa's kaiser_best). Always explicit, never picked by what
+# happens to be installed, so model inputs don't change with the environment.
+RESAMPLER = os.environ.get('VOICE_EMOTION_RESAMPLER', 'soxr').lower()
+torchaudio = None
+if RESAMPLER == 'torchaudio':
+    try:
+        import torchaudio
+    except ImportError:
+        print("torchaudio not installed, resampling with soxr", file=sys.stderr)
+        RESAMPLER = 'soxr'
+elif RESAMPLER != 'soxr':
+    print(f"Unsupported VOICE_EMOTION_RESAMPLER '{RESAMPLER}', using soxr", file=sys.stderr)
+    RESAMPLER = 'soxr'
+
+# Inference only: no autograd bookkeeping anywhere in this process
+torch.set_grad_enabled(False)
+torch.set_num_threads(NUM_THREADS)
+torch.set_num_interop_threads(1)
+
+# Inference backend: 'torch' (HF PyTorch model) or 'onnx' (ONNX Runtime, INT8 weights)
+BACKEND = os.environ.get('VOICE_EMOTION_BACKEND', 'torch').lower()
+if BACKEND not in ('torch', 'onnx'):
+    # CTranslate2 only ships Wav2Vec2 with a CTC head, so it cannot run these classifiers
+    print(f"Unsupported VOICE_EMOTION_BACKEND '{BACKEND}', using torch", file=sys.stderr)
+    BACKEND = 'torch'
+
+# Dynamic INT8 quantization of the Linear layers (CPU inference).
+# Set VOICE_EMOTION_QUANTIZE=false to run the original FP32 weights.
+QUANTIZE = os.environ.get('VOICE_EMOTION_QUANTIZE', 'true').lower() != 'false'
+QUANTIZED_CACHE_DIR = os.environ.get(
+    'VOICE_EMOTION_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'models', 'quantized')
+)
+
+def cpu_supports_bf16():
+    try:
+        return torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    except (AttributeError, RuntimeError):
+        return False
+
+# BF16 weights + autocast for the FP32 torch path (VOICE_EMOTION_BF16=true).
+# Only used when INT8 quantization is off and the CPU has native BF16 support.
+USE_BF16 = (
+    os.environ.get('VOICE_EMOTION_BF16', 'false').lower() == 'true'
+    and BACKEND == 'torch'
+    and not QUANTIZE
+    and cpu_supports_bf16()
+)
+
+# Compile the torch forward with TorchInductor (VOICE_EMOTION_COMPILE=true).
+# Off by default: compilation adds tens of seconds to worker start-up.
+COMPILE = os.environ.get('VOICE_EMOTION_COMPILE', 'false').lower() == 'true' and BACKEND == 'torch'
+
+# Batch worker: requests arriving within MAX_BATCH_WAIT_MS of each other are
+# collected (up to MAX_BATCH_SIZE) and share padded forward passes. Models that
+# cannot pad only batch equal-length clips and never wait (see can_pad_batches).
+MAX_BATCH_SIZE = get_int_env('VOICE_EMOTION_MAX_BATCH', 8)
+MAX_BATCH_WAIT_MS = get_int_env('VOICE_EMOTION_MAX_WAIT_MS', 10, minimum=0)
+
+# Sample rate expected by Wav2Vec2 models
+TARGET_SAMPLE_RATE = 16000
+
+# Default labels, indexed by class id (works for most emotion models)
+DEFAULT_LABELS = ("angry", "calm", "disgust", "fear", "happy", "neutral", "sad", "surprise")
 
 def get_label_mapping(model_name, config):
     """
-    Get emotion labels for the model.
+    Get emotion labels for the model as a tuple indexed by class id.
     Try to use model's config first, fall back to default mapping.
     """
+    id2label = None
     try:
         if hasattr(config, 'id2label') and config.id2label:
-            return config.id2label
+            id2label = config.id2label
     except:
         pass
     
-    # Use default labels
-    return DEFAULT_LABELS
+    if not id2label:
+        # Use default labels
+        id2label = dict(enumerate(DEFAULT_LABELS))
+    
+    return tuple(id2label.get(i, f"emotion_{i}") for i in range(config.num_labels))
 
-def classify_audio(model_name, audio_path):
+def select_quantized_engine():
     """
-    Classify emotion from audio file using HuggingFace Wav2Vec2 models
+    Pick the INT8 GEMM backend for this CPU: QNNPACK on ARM, FBGEMM on x86
+    """
+    preferred = 'qnnpack' if platform.machine().lower() in ('arm64', 'aarch64') else 'fbgemm'
+    if preferred in torch.backends.quantized.supported_engines:
+        torch.backends.quantized.engine = preferred
+
+def get_cache_path(model_name, config, extension):
     """
+    Cache file for a derived model. The key includes the Hub revision and the
+    torch/transformers versions, so upgrades never pick up a stale file.
+    """
+    revision = (getattr(config, '_commit_hash', None) or 'local')[:12]
+    versions = f"torch{torch.__version__}-transformers{transformers_version}".replace('+', '_')
+    return os.path.join(
+        QUANTIZED_CACHE_DIR,
+        f"{model_name.replace('/', '__')}-{revision}-{versions}{extension}"
+    )
+
+def quantize_linear_layers(model):
+    """
+    Quantize all nn.Linear layers to INT8 in place (no FP32 copy is kept)
+    """
+    select_quantized_engine()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+def load_quantized_model(model_name, config):
+    """
+    Load previously quantized weights from disk, or None if not cached.
+    Only the state_dict is cached (loaded with weights_only=True); the
+    quantized module structure is rebuilt from the config.
+    """
+    cache_path = get_cache_path(model_name, config, '.int8.pt')
+    if not os.path.exists(cache_path):
+        return None
+    
     try:
-        # Validate model type first
-        print(f"Loading model config: {model_name}...", file=sys.stderr)
-        config = AutoConfig.from_pretrained(model_name)
-        
-        # Check if this is an audio model
-        if config.model_type not in ['wav2vec2', 'wavlm', 'hubert']:
-            return {
-                "success": False,
-                "error": f"Model '{model_name}' is a '{config.model_type}' model, not an audio model! Please use a Wav2Vec2/WavLM/Hubert model for audio emotion detection."
-            }
-        
-        # Load model and processor
+        print(f"Loading quantized model: {cache_path}...", file=sys.stderr)
+        model = quantize_linear_layers(model_from_config(config))
+        model.load_state_dict(torch.load(cache_path, weights_only=True))
+        return model
+    except Exception as e:
+        print(f"Quantized cache unusable, rebuilding: {e}", file=sys.stderr)
+        return None
+
+def quantize_model(model, model_name, config):
+    """
+    Quantize all nn.Linear layers to INT8 and cache the weights on disk
+    """
+    print("Quantizing model to INT8...", file=sys.stderr)
+    model = quantize_linear_layers(model)
+    
+    try:
+        os.makedirs(QUANTIZED_CACHE_DIR, exist_ok=True)
+        torch.save(model.state_dict(), get_cache_path(model_name, config, '.int8.pt'))
+    except Exception as e:
+        print(f"Could not cache quantized model: {e}", file=sys.stderr)
+    
+    return model
+
+def from_pretrained_model(model_name):
+    """
+    Load the HF model with fused PyTorch SDPA attention where supported,
+    falling back to the eager attention on older transformers releases
+    """
+    try:
+        return Wav2Vec2ForSequenceClassification.from_pretrained(model_name, attn_implementation="sdpa")
+    except (TypeError, ValueError, ImportError) as e:
+        print(f"SDPA attention unavailable, using eager attention: {e}", file=sys.stderr)
+        return Wav2Vec2ForSequenceClassification.from_pretrained(model_name)
+
+def model_from_config(config):
+    """
+    Build the model structure for a config without initialising its weights
+    (they are about to be overwritten), with the same SDPA-or-eager attention
+    choice as from_pretrained_model
+    """
+    with no_init_weights():
+        try:
+            return Wav2Vec2ForSequenceClassification._from_config(config, attn_implementation="sdpa")
+        except (TypeError, ValueError, ImportError):
+            return Wav2Vec2ForSequenceClassification._from_config(config)
+
+class CompiledEmotionModel:
+    """
+    torch.compile'd model that permanently falls back to the eager model if a
+    call fails (e.g. a recompile for a new batch shape errors out)
+    """
+    
+    def __init__(self, compiled, eager):
+        self.compiled = compiled
+        self.eager = eager
+    
+    def __call__(self, **inputs):
+        if self.compiled is not None:
+            try:
+                return self.compiled(**inputs)
+            except Exception as e:
+                print(f"Compiled model failed, using eager model: {e}", file=sys.stderr)
+                self.compiled = None
+        return self.eager(**inputs)
+
+def compile_model(model, processor):
+    """
+    Compile the model and warm it up the way the worker calls it (processor
+    output kwargs, batch sizes 1 and 2 of a 3 second clip) so the graph is
+    built before the first real request. Falls back to the eager model on failure.
+    """
+    print("Compiling model with torch.compile...", file=sys.stderr)
+    compiled = torch.compile(model, fullgraph=False, dynamic=True)
+    
+    try:
+        clip = np.zeros(3 * TARGET_SAMPLE_RATE, dtype=np.float32)
+        for batch_size in (1, 2):
+            inputs = processor(
+                [clip] * batch_size,
+                sampling_rate=TARGET_SAMPLE_RATE,
+                return_tensors="pt",
+                padding=True
+            )
+            with torch.inference_mode(), torch.autocast(device_type='cpu', dtype=torch.bfloat16, enabled=USE_BF16):
+                compiled(**inputs)
+        return CompiledEmotionModel(compiled, model)
+    except Exception as e:
+        print(f"torch.compile failed, using eager model: {e}", file=sys.stderr)
+        return model
+
+def load_torch_model(model_name, config, processor):
+    """
+    Load the HF PyTorch model, INT8-quantized unless VOICE_EMOTION_QUANTIZE=false
+    """
+    model = load_quantized_model(model_name, config) if QUANTIZE else None
+    if model is None:
         print(f"Loading model: {model_name}...", file=sys.stderr)
-        model = Wav2Vec2ForSequenceClassification.from_pretrained(model_name)
-        processor = Wav2Vec2FeatureExtractor.from_pretrained(model_name)
-        
-        # Get label mapping
-        id2label = get_label_mapping(model_name, config)
+        model = from_pretrained_model(model_name)
+        if QUANTIZE:
+            model = quantize_model(model, model_name, config)
+    if USE_BF16:
+        model = model.to(torch.bfloat16)
+    model.eval()
+    if COMPILE:
+        model = compile_model(model, processor)
+    return model
+
+def export_onnx_model(model_name, config):
+    """
+    Export the model to ONNX once and quantize its weights to INT8.
+    Returns the path of the cached INT8 model.
+    """
+    int8_path = get_cache_path(model_name, config, '.int8.onnx')
+    if os.path.exists(int8_path):
+        return int8_path
+    
+    import onnxruntime as ort
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    
+    print(f"Exporting model to ONNX: {model_name}...", file=sys.stderr)
+    model = Wav2Vec2ForSequenceClassification.from_pretrained(model_name)
+    model.config.return_dict = False
+    model.eval()
+    
+    os.makedirs(QUANTIZED_CACHE_DIR, exist_ok=True)
+    fp32_path = get_cache_path(model_name, config, '.onnx')
+    torch.onnx.export(
+        model,
+        (torch.zeros(1, TARGET_SAMPLE_RATE),),
+        fp32_path,
+        input_names=['input_values'],
+        output_names=['logits'],
+        dynamic_axes={'input_values': {0: 'batch', 1: 'time'}, 'logits': {0: 'batch'}},
+        opset_version=17
+    )
+    
+    # Only MatMul: quantizing the Conv1d feature encoder yields ConvInteger
+    # nodes, which the ORT CPU provider cannot run
+    print("Quantizing ONNX model to INT8...", file=sys.stderr)
+    tmp_path = int8_path + '.tmp'
+    quantize_dynamic(fp32_path, tmp_path, op_types_to_quantize=['MatMul'], weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+    
+    # Only cache a model that ONNX Runtime can actually load
+    try:
+        ort.InferenceSession(tmp_path, providers=['CPUExecutionProvider'])
+    except Exception:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, int8_path)
+    
+    return int8_path
+
+class OnnxEmotionModel:
+    """
+    ONNX Runtime session exposing the same call/output shape as the HF model
+    """
+    
+    def __init__(self, onnx_path):
+        import onnxruntime as ort
         
-        # Load and resample audio to 16kHz
-        print(f"Loading audio: {audio_path}...", file=sys.stderr)
-        speech, sample_rate = librosa.load(audio_path, sr=16000)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = NUM_THREADS
+        options.inter_op_num_threads = 1
         
-        # Process audio
-        inputs = processor(
-            speech,
-            sampling_rate=sample_rate,
-            return_tensors="pt",
-            padding=True
+        print(f"Loading ONNX model: {onnx_path}...", file=sys.stderr)
+        self.session = ort.InferenceSession(
+            onnx_path,
+            sess_options=options,
+            providers=['CPUExecutionProvider']
         )
-        
-        # Get predictions
-        with torch.no_grad():
-            outputs = model(**inputs)
-            logits = outputs.logits
-            probs = torch.nn.functional.softmax(logits, dim=1).squeeze()
-            
-            # Handle single dimension output
-            if probs.dim() == 0:
-                probs = probs.unsqueeze(0)
-            
-            probs = probs.tolist()
-        
+    
+    def __call__(self, input_values, **kwargs):
+        # Batches only ever hold equal-length clips, so any attention_mask is
+        # all ones and the graph needs input_values alone
+        logits = self.session.run(['logits'], {'input_values': input_values.numpy()})[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+# Resamplers keyed by source sample rate, so each filter kernel is built once
+_RESAMPLERS = {}
+
+def build_torchaudio_resampler(sample_rate):
+    """
+    Kaiser-windowed sinc resampler with librosa's kaiser_best parameters
+    """
+    # The method was renamed from 'kaiser_window' in torchaudio 2.1
+    for method in ('sinc_interp_kaiser', 'kaiser_window'):
+        try:
+            return torchaudio.transforms.Resample(
+                sample_rate,
+                TARGET_SAMPLE_RATE,
+                resampling_method=method,
+                lowpass_filter_width=64,
+                rolloff=0.9475937167399596,
+                beta=14.769656459379492
+            )
+        except ValueError:
+            continue
+    return torchaudio.transforms.Resample(sample_rate, TARGET_SAMPLE_RATE)
+
+def resample(speech, sample_rate):
+    """
+    Resample mono float32 audio to 16kHz
+    """
+    if RESAMPLER == 'soxr':
+        return soxr.resample(speech, sample_rate, TARGET_SAMPLE_RATE)
+    
+    resampler = _RESAMPLERS.get(sample_rate)
+    if resampler is None:
+        resampler = build_torchaudio_resampler(sample_rate)
+        _RESAMPLERS[sample_rate] = resampler
+    
+    return resampler(torch.from_numpy(speech)).numpy()
+
+def load_audio(audio_path):
+    """
+    Load audio as mono float32 at 16kHz.
+    soundfile decodes WAV/FLAC/OGG (and MP3 with libsndfile >= 1.1) straight
+    to float32; anything it can't read falls back to librosa/audioread.
+    """
+    try:
+        speech, sample_rate = sf.read(audio_path, dtype='float32')
+    except RuntimeError:
+        speech, _ = librosa.load(audio_path, sr=TARGET_SAMPLE_RATE)
+        return speech
+    
+    # Downmix to mono
+    if speech.ndim > 1:
+        speech = speech.mean(axis=1)
+    
+    # 16kHz input (e.g. our own WAV conversions) needs no resampling at all
+    if sample_rate != TARGET_SAMPLE_RATE:
+        speech = resample(speech, sample_rate)
+    
+    return speech
+
+# Loaded models, keyed by model name. Loading weights dominates wall time, so
+# every model is loaded once per process and reused across classifications.
+_MODEL_CACHE = {}
+
+def load_model(model_name):
+    """
+    Load (or fetch from cache) the Wav2Vec2 model, feature extractor and labels
+    """
+    if model_name in _MODEL_CACHE:
+        return _MODEL_CACHE[model_name]
+    
+    # Validate model type first
+    print(f"Loading model config: {model_name}...", file=sys.stderr)
+    config = AutoConfig.from_pretrained(model_name)
+    
+    # Check if this is an audio model
+    if config.model_type not in ['wav2vec2', 'wavlm', 'hubert']:
+        raise ValueError(
+            f"Model '{model_name}' is a '{config.model_type}' model, not an audio model! Please use a Wav2Vec2/WavLM/Hubert model for audio emotion detection."
+        )
+    
+    # Load processor and model
+    processor = Wav2Vec2FeatureExtractor.from_pretrained(model_name)
+    if BACKEND == 'onnx':
+        model = OnnxEmotionModel(export_onnx_model(model_name, config))
+    else:
+        model = load_torch_model(model_name, config, processor)
+    
+    # Get label mapping
+    labels = get_label_mapping(model_name, config)
+    
+    _MODEL_CACHE[model_name] = (model, processor, labels)
+    return _MODEL_CACHE[model_name]
+
+def build_error_result(error):
+    """
+    Log the active exception and build the JSON error result
+    """
+    import traceback
+    error_details = traceback.format_exc()
+    print(f"Error details:\n{error_details}", file=sys.stderr)
+    
+    # The traceback travels with the result, since the worker's shared stderr
+    # cannot be attributed to a single request
+    return {
+        "success": False,
+        "error": str(error),
+        "details": error_details[-2000:]
+    }
+
+def classify_speeches(model, processor, labels, model_name, speeches):
+    """
+    Classify 16kHz clips in a single forward pass. Clips of different
+    lengths must only be passed together when can_pad_batches() holds.
+    """
+    inputs = processor(
+        speeches,
+        sampling_rate=TARGET_SAMPLE_RATE,
+        return_tensors="pt",
+        padding=True
+    )
+    
+    # Get predictions
+    # Inputs stay FP32; autocast downcasts them for the BF16 weights
+    with torch.inference_mode(), torch.autocast(device_type='cpu', dtype=torch.bfloat16, enabled=USE_BF16):
+        outputs = model(**inputs)
+        logits = outputs.logits.float()
+        # argmax(softmax(x)) == argmax(x); softmax is only needed for reporting
+        dominant_indices = logits.argmax(dim=1).tolist()
+        probs_rows = torch.softmax(logits, dim=1).tolist()
+    
+    results = []
+    for probs, dominant_idx in zip(probs_rows, dominant_indices):
         # Build scores dictionary
-        scores = {}
-        for i in range(len(probs)):
-            emotion_key = str(i)
-            emotion = id2label.get(emotion_key, f"emotion_{i}")
-            scores[emotion] = float(probs[i])
+        scores = dict(zip(labels, probs))
         
         # Get dominant emotion
-        max_prob = max(probs)
-        dominant_idx = probs.index(max_prob)
-        dominant_emotion = id2label.get(str(dominant_idx), f"emotion_{dominant_idx}")
+        max_prob = probs[dominant_idx]
+        dominant_emotion = labels[dominant_idx]
         
         print(f"✓ Detected: {dominant_emotion} ({max_prob:.1%})", file=sys.stderr)
         
-        return {
+        results.append({
             "success": True,
             "emotion": dominant_emotion,
             "confidence": float(max_prob),
             "scores": scores,
             "model": model_name
-        }
-        
+        })
+    
+    return results
+
+def can_pad_batches(processor):
+    """
+    Whether clips of different lengths can be padded into one forward pass.
+    Needs the torch model and a checkpoint that takes an attention mask
+    (layer-norm feature encoders, e.g. ehcalabres/prithivMLmods): the mask
+    keeps padding out of the feature normalization and the mean pooling.
+    Group-norm checkpoints (e.g. wav2vec2-base) and the ONNX graph take no mask.
+    """
+    return BACKEND == 'torch' and bool(getattr(processor, 'return_attention_mask', False))
+
+def classify_batch(model_name, audio_paths):
+    """
+    Classify emotion for several audio files. Clips share padded forward
+    passes where the model supports it, otherwise only clips of equal length
+    are batched. Returns one result per path, in order.
+    """
+    try:
+        model, processor, labels = load_model(model_name)
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Error details:\n{error_details}", file=sys.stderr)
+        error_result = build_error_result(e)
+        return [dict(error_result) for _ in audio_paths]
+    
+    results = [None] * len(audio_paths)
+    
+    # Load and resample audio to 16kHz; a bad file only fails its own request.
+    # Without an attention mask, group by length: padding would change the
+    # feature normalization and the mean pooling, making a result depend on
+    # which other requests it was batched with.
+    pad = can_pad_batches(processor)
+    groups = {}
+    for i, audio_path in enumerate(audio_paths):
+        try:
+            print(f"Loading audio: {audio_path}...", file=sys.stderr)
+            speech = load_audio(audio_path)
+            groups.setdefault(0 if pad else len(speech), []).append((i, speech))
+        except Exception as e:
+            results[i] = build_error_result(e)
+    
+    for group in groups.values():
+        indices = [i for i, _ in group]
+        try:
+            group_results = classify_speeches(
+                model, processor, labels, model_name, [speech for _, speech in group]
+            )
+            for i, result in zip(indices, group_results):
+                results[i] = result
+        except Exception as e:
+            error_result = build_error_result(e)
+            for i in indices:
+                results[i] = dict(error_result)
+    
+    return results
+
+def classify_audio(model_name, audio_path):
+    """
+    Classify emotion from audio file using HuggingFace Wav2Vec2 models
+    """
+    return classify_batch(model_name, [audio_path])[0]
+
+def read_requests(requests):
+    """
+    Parse stdin lines into (request_id, audio_path) on the queue; None marks
+    the end of input
+    """
+    for line in sys.stdin:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
         
-        return {
-            "success": False,
-            "error": str(e)
-        }
+        request_id, sep, audio_path = line.partition("\t")
+        if not sep:
+            request_id, audio_path = None, line
+        
+        requests.put((request_id, audio_path))
+    
+    requests.put(None)
 
-if __name__ == "__main__":
+def run_batch(model_name):
+    """
+    Persistent worker mode: load the model once, then classify one request per
+    stdin line ("audio_path" or "request_id\taudio_path"), writing one JSON
+    result per line to stdout. Requests that arrive together are batched.
+    """
     try:
-        # Get arguments: model_name, audio_path
-        model_name = sys.argv[1]
-        audio_path = sys.argv[2]
+        _, processor, _ = load_model(model_name)
+        # Waiting for more requests only pays off when they can share a padded
+        # forward pass; otherwise just take whatever is already queued
+        batch_wait_ms = MAX_BATCH_WAIT_MS if can_pad_batches(processor) else 0
+    except Exception as e:
+        # Surface load errors per request instead of dying, so callers get a reply
+        print(f"Model load failed: {e}", file=sys.stderr)
+        batch_wait_ms = 0
+    
+    requests = queue.Queue()
+    threading.Thread(target=read_requests, args=(requests,), daemon=True).start()
+    
+    print("Ready for batch requests", file=sys.stderr)
+    
+    end_of_input = False
+    while not end_of_input:
+        request = requests.get()
+        if request is None:
+            break
         
-        # Run classification
-        result = classify_audio(model_name, audio_path)
+        # Collect more requests until the batch is full or the wait expires;
+        # requests already queued are always taken
+        batch = [request]
+        deadline = time.monotonic() + batch_wait_ms / 1000
+        while len(batch) < MAX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    request = requests.get(timeout=remaining)
+                else:
+                    request = requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                end_of_input = True
+                break
+            batch.append(request)
         
-        # Output JSON result
-        print(json.dumps(result))
+        results = classify_batch(model_name, [audio_path for _, audio_path in batch])
+        for (request_id, _), result in zip(batch, results):
+            if request_id is not None:
+                result["id"] = request_id
+            print(json.dumps(result), flush=True)
+
+if __name__ == "__main__":
+    try:
+        if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+            # Get arguments: --batch model_name
+            run_batch(sys.argv[2])
+        else:
+            # Get arguments: model_name, audio_path
+            model_name = sys.argv[1]
+            audio_path = sys.argv[2]
+            
+            # Run classification
+            result = classify_audio(model_name, audio_path)
+            
+            # Output JSON result
+            print(json.dumps(result))
         
     except Exception as e:
         error_result = {
@@ -221,9 +221,101 @@ export const extractAudioFeatures = async (audioPath) => {
   };
 };
 
+// Persistent HuggingFace worker: the Python process loads the model once and
+// then serves one "id\taudio_path" request per stdin line
+let huggingfaceWorker = null;
+let huggingfaceLastActivity = 0;
+let huggingfaceRequestId = 0;
+const huggingfacePending = new Map();
+
+// Timeout per request (model download can take time first run)
+const HUGGINGFACE_TIMEOUT_MS = 180000;
+
+const HUGGINGFACE_FALLBACK = { emotion: 'neutral', confidence: 0.5, scores: { neutral: 0.5 }, useFallback: true };
+
+/**
+ * Get (or start) the persistent HuggingFace Python worker
+ */
+const getHuggingFaceWorker = (model, scriptPath) => {
+  if (huggingfaceWorker) {
+    return huggingfaceWorker;
+  }
+
+  console.log(`🚀 Starting HuggingFace worker (model loads once)...`);
+
+  // Use full Python path to ensure correct environment
+  const pythonPath = process.platform === 'win32' 
+    ? 'C:\\Users\\ayush\\AppData\\Local\\Programs\\Python\\Python313\\python.exe'
+    : 'python3';
+
+  const python = spawn(pythonPath, [scriptPath, '--batch', model], {
+    cwd: path.resolve('./'),
+    env: { ...process.env }
+  });
+
+  let outputBuffer = '';
+  let errorOutput = '';
+  huggingfaceLastActivity = Date.now();
+
+  python.stdout.on('data', (data) => {
+    huggingfaceLastActivity = Date.now();
+    outputBuffer += data.toString();
+
+    // One JSON result per line
+    let newlineIndex;
+    while ((newlineIndex = outputBuffer.indexOf('\n')) !== -1) {
+      const line = outputBuffer.slice(0, newlineIndex).trim();
+      outputBuffer = outputBuffer.slice(newlineIndex + 1);
+      if (!line) continue;
+
+      try {
+        const result = JSON.parse(line);
+        const pending = huggingfacePending.get(result.id);
+        if (pending) {
+          huggingfacePending.delete(result.id);
+          pending(result);
+        }
+      } catch (e) {
+        console.warn(`⚠️  HuggingFace parsing error: ${e.message}`);
+      }
+    }
+  });
+
+  python.stderr.on('data', (data) => {
+    huggingfaceLastActivity = Date.now();
+    // Keep only the recent tail for diagnosing worker crashes
+    errorOutput = (errorOutput + data.toString()).slice(-4000);
+  });
+
+  const handleExit = (reason) => {
+    if (huggingfaceWorker !== python) {
+      return;
+    }
+    huggingfaceWorker = null;
+
+    console.warn(`⚠️  ${reason}`);
+    const errLines = errorOutput.split('\n').filter(line => 
+      !line.includes('Xet Storage') && 
+      !line.includes('hf_xet') &&
+      line.trim().length > 0
+    ).join('\n');
+    if (errLines) console.warn(`   Python stderr: ${errLines.slice(-500)}`);
+
+    huggingfacePending.forEach((pending) => pending({ success: false, error: reason }));
+    huggingfacePending.clear();
+  };
+
+  python.stdin.on('error', (err) => console.warn(`⚠️  HuggingFace worker stdin error: ${err.message}`));
+  python.on('close', (code) => handleExit(`HuggingFace worker exited with code ${code}`));
+  python.on('error', (err) => handleExit(`HuggingFace worker failed to start: ${err.message}`));
+
+  huggingfaceWorker = python;
+  return python;
+};
+
 /**
  * Detect emotion from voice using HuggingFace prithivMLmods model
- * Runs locally via Python with transformers library
+ * Runs locally via a persistent Python worker with transformers library
  */
 export const detectEmotionFromVoice = async (audioPath) => {
   return new Promise((resolve) => {
@@ -233,79 +325,54 @@ export const detectEmotionFromVoice = async (audioPath) => {
 
       if (!fs.existsSync(scriptPath)) {
         console.warn(`⚠️  HuggingFace Python script not found at: ${scriptPath}`);
-        resolve({ emotion: 'neutral', confidence: 0.5, scores: { neutral: 0.5 }, useFallback: true });
+        resolve(HUGGINGFACE_FALLBACK);
         return;
       }
 
       console.log(`🧠 Running HuggingFace local model inference...`);
       console.log(`   Model: ${model}`);
 
-      // Use full Python path to ensure correct environment
-      const pythonPath = process.platform === 'win32' 
-        ? 'C:\\Users\\ayush\\AppData\\Local\\Programs\\Python\\Python313\\python.exe'
-        : 'python3';
-      
-      const python = spawn(pythonPath, [scriptPath, model, audioPath], {
-        cwd: path.resolve('./'),
-        env: { ...process.env }
-      });
-      
-      let output = '';
-      let errorOutput = '';
-
-      python.stdout.on('data', (data) => {
-        output += data.toString();
-      });
-
-      python.stderr.on('data', (data) => {
-        errorOutput += data.toString();
-      });
+      const worker = getHuggingFaceWorker(model, scriptPath);
+      const requestId = String(++huggingfaceRequestId);
 
-      python.on('close', (code) => {
-        try {
-          if (code === 0 && output) {
-            const result = JSON.parse(output.trim());
-            if (result.success) {
-              console.log(`✅ HuggingFace detected: ${result.emotion} (${(result.confidence * 100).toFixed(1)}%)`);
-              resolve({
-                emotion: result.emotion,
-                confidence: result.confidence,
-                scores: result.scores,
-                model: 'huggingface'
-              });
-              return;
-            } else {
-              console.warn(`⚠️  HuggingFace model error: ${result.error}`);
-            }
-          }
-          
-          // Failed - return fallback marker
-          console.warn(`⚠️  HuggingFace model failed, will use fallback`);
-          if (errorOutput) {
-            const errLines = errorOutput.split('\n').filter(line => 
-              !line.includes('Xet Storage') && 
-              !line.includes('hf_xet') &&
-              line.trim().length > 0
-            ).join('\n');
-            if (errLines) console.warn(`   Python stderr: ${errLines.substring(0, 500)}`);
-          }
-          resolve({ emotion: 'neutral', confidence: 0.5, scores: { neutral: 0.5 }, useFallback: true });
-        } catch (e) {
-          console.warn(`⚠️  HuggingFace parsing error: ${e.message}`);
-          resolve({ emotion: 'neutral', confidence: 0.5, scores: { neutral: 0.5 }, useFallback: true });
+      // Timeout only gives up on this request; the shared worker is restarted
+      // only if it has been completely silent for the whole timeout window
+      const timeout = setTimeout(() => {
+        huggingfacePending.delete(requestId);
+        console.warn(`⚠️  HuggingFace model timeout (3 minutes exceeded)`);
+        if (huggingfaceWorker === worker && Date.now() - huggingfaceLastActivity >= HUGGINGFACE_TIMEOUT_MS) {
+          console.warn(`⚠️  HuggingFace worker unresponsive, restarting`);
+          worker.kill();
         }
+        resolve(HUGGINGFACE_FALLBACK);
+      }, HUGGINGFACE_TIMEOUT_MS);
+
+      huggingfacePending.set(requestId, (result) => {
+        clearTimeout(timeout);
+
+        if (result.success) {
+          console.log(`✅ HuggingFace detected: ${result.emotion} (${(result.confidence * 100).toFixed(1)}%)`);
+          resolve({
+            emotion: result.emotion,
+            confidence: result.confidence,
+            scores: result.scores,
+            model: 'huggingface'
+          });
+          return;
+        }
+
+        // Failed - return fallback marker
+        console.warn(`⚠️  HuggingFace model error: ${result.error}`);
+        console.warn(`⚠️  HuggingFace model failed, will use fallback`);
+        if (result.details) console.warn(`   Python traceback: ${result.details.substring(0, 500)}`);
+        resolve(HUGGINGFACE_FALLBACK);
       });
 
-      // Timeout after 180 seconds (model download can take time first run)
-      setTimeout(() => {
-        python.kill();
-        console.warn(`⚠️  HuggingFace model timeout (3 minutes exceeded)`);
-        resolve({ emotion: 'neutral', confidence: 0.5, scores: { neutral: 0.5 }, useFallback: true });
-      }, 180000);
+      worker.stdin.write(`${requestId}\t${audioPath}\n`);
 
     } catch (error) {
       console.warn(`⚠️  HuggingFace model error: ${error.message}`);
-      resolve({ emotion: 'neutral', confidence: 0.5, scores: { neutral: 0.5 }, useFallback: true });
+      resolve(HUGGINGFACE_FALLBACK);
     }
   });
 };
@@ -474,10 +541,25 @@ const combineEmotions = (results) => {
 export const analyzeVoiceEmotion = async (audioPath) => {
   console.log(`🎤 Analyzing voice emotion from: ${audioPath}`);
   
+  // Decode browser uploads (WebM/Opus etc.) once to 16kHz mono WAV: Groq reads
+  // it directly and the voice model's soundfile loader can skip resampling
+  // (libsndfile cannot decode WebM at all)
+  let wavPath = audioPath;
+  let convertedWavPath = null;
+  const extension = path.extname(audioPath).toLowerCase();
+  if (extension && extension !== '.wav') {
+    try {
+      convertedWavPath = await convertToWav(audioPath);
+      wavPath = convertedWavPath;
+    } catch (error) {
+      console.warn(`⚠️  WAV conversion failed, using original audio: ${error.message}`);
+    }
+  }
+  
   // Step 1: Speech-to-Text using Groq Whisper API
   let transcriptResult;
   try {
-    transcriptResult = await speechToTextGroq(audioPath);
+    transcriptResult = await speechToTextGroq(wavPath);
     console.log(`✅ Transcript: "${transcriptResult.transcript}"`);
   } catch (error) {
     console.error(`❌ STT Error:`, error.message);
@@ -512,11 +594,20 @@ export const analyzeVoiceEmotion = async (audioPath) => {
   // Step 4: Attempt voice emotion detection with HuggingFace model
   console.log(`🎙️ Attempting voice emotion detection...`);
   
-  const huggingfaceResult = await detectEmotionFromVoice(audioPath).catch(err => {
+  const huggingfaceResult = await detectEmotionFromVoice(wavPath).catch(err => {
     console.warn(`⚠️  HuggingFace voice model failed: ${err.message}`);
     return null;
   });
 
+  // Clean up the converted WAV now that both models have read it
+  if (convertedWavPath && fs.existsSync(convertedWavPath)) {
+    try {
+      fs.unlinkSync(convertedWavPath);
+    } catch (err) {
+      console.warn(`⚠️ Failed to clean up converted WAV: ${err.message}`);
+    }
+  }
+
   // Step 5: Combine text and voice emotion results
   let emotionResult;
   const validResults = [];
@@ -0,0 +1,78 @@
+"""
+Test Script: Verify Voice Emotion Batch Consistency
+Tests that classifying audio files in one batch returns the same emotions and
+scores as classifying each file on its own.
+
+Usage: python test-voice-batch-consistency.py [model_name]
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'voice-service'))
+import huggingface_emotion as hf
+
+SCORE_TOLERANCE = 1e-4
+
+def write_clips(directory):
+    """
+    Write synthetic clips: two of equal length and one shorter clip, which is
+    padded into their batch for attention-mask models and classified on its
+    own otherwise
+    """
+    rng = np.random.default_rng(0)
+    clips = [
+        ('tone_220hz_2s.wav', 220, 2.0),
+        ('tone_440hz_2s.wav', 440, 2.0),
+        ('tone_330hz_1s.wav', 330, 1.0)
+    ]
+    
+    paths = []
+    for filename, frequency, seconds in clips:
+        t = np.arange(int(seconds * hf.TARGET_SAMPLE_RATE)) / hf.TARGET_SAMPLE_RATE
+        speech = 0.5 * np.sin(2 * np.pi * frequency * t) + 0.05 * rng.standard_normal(t.size)
+        path = os.path.join(directory, filename)
+        sf.write(path, speech.astype(np.float32), hf.TARGET_SAMPLE_RATE)
+        paths.append(path)
+    
+    return paths
+
+def test_batch_consistency(model_name):
+    print('🧪 Testing Voice Emotion Batch Consistency\n')
+    print('=' * 60)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        paths = write_clips(directory)
+        single_results = [hf.classify_audio(model_name, path) for path in paths]
+        batch_results = hf.classify_batch(model_name, paths)
+    
+    failures = 0
+    for path, single, batched in zip(paths, single_results, batch_results):
+        name = os.path.basename(path)
+        if not (single['success'] and batched['success']):
+            print(f"❌ {name}: classification failed ({single.get('error') or batched.get('error')})")
+            failures += 1
+            continue
+        
+        max_diff = max(abs(single['scores'][label] - batched['scores'][label]) for label in single['scores'])
+        if single['emotion'] != batched['emotion'] or max_diff > SCORE_TOLERANCE:
+            print(f"❌ {name}: single={single['emotion']} batched={batched['emotion']} max score diff={max_diff:.2e}")
+            failures += 1
+        else:
+            print(f"✅ {name}: {single['emotion']} (max score diff {max_diff:.2e})")
+    
+    print('=' * 60)
+    if failures:
+        print(f"❌ {failures} of {len(paths)} clips differ between batched and single classification")
+        return False
+    
+    print(f"✅ All {len(paths)} clips match")
+    return True
+
+if __name__ == "__main__":
+    model_name = sys.argv[1] if len(sys.argv) > 1 else os.environ.get('VOICE_EMOTION_MODEL', 'superb/wav2vec2-base-superb-er')
+    sys.exit(0 if test_batch_consistency(model_name) else 1)
@@ -0,0 +1,88 @@
+"""
+Test Script: Verify INT8 Voice Emotion Accuracy
+Tests that the dynamically quantized (INT8) voice model predicts the same
+emotions as the original FP32 model, with scores within a small tolerance.
+
+Usage: python test-voice-quantization-accuracy.py [model_name] [audio files...]
+Without audio files, synthetic clips are used; pass real speech recordings
+for a meaningful accuracy check.
+"""
+
+import copy
+import os
+import sys
+import tempfile
+
+import numpy as np
+import soundfile as sf
+from transformers import AutoConfig, Wav2Vec2FeatureExtractor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'voice-service'))
+import huggingface_emotion as hf
+
+SCORE_TOLERANCE = 0.05
+
+def write_clips(directory):
+    """
+    Write synthetic 2 second clips (tones plus noise)
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(2 * hf.TARGET_SAMPLE_RATE) / hf.TARGET_SAMPLE_RATE
+    
+    paths = []
+    for frequency in (220, 330, 440):
+        speech = 0.5 * np.sin(2 * np.pi * frequency * t) + 0.05 * rng.standard_normal(t.size)
+        path = os.path.join(directory, f'tone_{frequency}hz.wav')
+        sf.write(path, speech.astype(np.float32), hf.TARGET_SAMPLE_RATE)
+        paths.append(path)
+    
+    return paths
+
+def compare(model_name, paths):
+    config = AutoConfig.from_pretrained(model_name)
+    processor = Wav2Vec2FeatureExtractor.from_pretrained(model_name)
+    labels = hf.get_label_mapping(model_name, config)
+    
+    fp32_model = hf.from_pretrained_model(model_name).eval()
+    int8_model = hf.quantize_linear_layers(copy.deepcopy(fp32_model)).eval()
+    
+    failures = 0
+    for path in paths:
+        speech = hf.load_audio(path)
+        fp32 = hf.classify_speeches(fp32_model, processor, labels, model_name, [speech])[0]
+        int8 = hf.classify_speeches(int8_model, processor, labels, model_name, [speech])[0]
+        
+        name = os.path.basename(path)
+        max_diff = max(abs(fp32['scores'][label] - int8['scores'][label]) for label in labels)
+        if fp32['emotion'] != int8['emotion'] or max_diff > SCORE_TOLERANCE:
+            print(f"❌ {name}: fp32={fp32['emotion']} int8={int8['emotion']} max score diff={max_diff:.3f}")
+            failures += 1
+        else:
+            print(f"✅ {name}: {fp32['emotion']} (max score diff {max_diff:.3f})")
+    
+    return failures
+
+def test_quantization_accuracy(model_name, paths):
+    print('🧪 Testing INT8 vs FP32 Voice Emotion Accuracy\n')
+    print('=' * 60)
+    
+    if paths:
+        failures = compare(model_name, paths)
+        total = len(paths)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            clips = write_clips(directory)
+            failures = compare(model_name, clips)
+            total = len(clips)
+    
+    print('=' * 60)
+    if failures:
+        print(f"❌ {failures} of {total} clips differ between INT8 and FP32")
+        return False
+    
+    print(f"✅ All {total} clips match")
+    return True
+
+if __name__ == "__main__":
+    model_name = sys.argv[1] if len(sys.argv) > 1 else os.environ.get('VOICE_EMOTION_MODEL', 'superb/wav2vec2-base-superb-er')
+    sys.exit(0 if test_quantization_accuracy(model_name, sys.argv[2:]) else 1)